@@ -1,25 +1,221 @@
 #!/usr/bin/env python3
 """Download music videos from YouTube and process them by stripping silence, normalizing
 loudness, setting tags, and moving to a directory."""
+import contextlib
+import copy
+import functools
+import itertools
+import json
 import logging
 import os
 import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-from typing import Tuple
+from typing import Optional, Tuple
+from urllib.parse import quote
 
-import eyed3
-import wikipedia
-from bs4 import BeautifulSoup
-from pydub import AudioSegment
 from titlecase import titlecase
-from yt_dlp import YoutubeDL
 
-logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
-DESTINATION = "Q:\\"
+logger = logging.getLogger(__name__)
+# Artists, albums, and genres repeat a lot when processing multiple videos
+cached_titlecase = functools.lru_cache(maxsize=4096)(titlecase)
+DESTINATION = Path("Q:\\")
+WIKIPEDIA_URL = "https://{lang}.wikipedia.org/api/rest_v1/page/html/{title}"
+WIKIPEDIA_SEARCH_URL = "https://{lang}.wikipedia.org/w/api.php"
+# Narrows the search down to musicians, where the Wikipedia has a template for that
+WIKIPEDIA_SEARCH_FILTERS = {"en": 'hastemplate:"Infobox musical artist"'}
+WIKIPEDIA_HEADERS = {"User-Agent": "yt-music (https://github.com/jonasw234/yt-music)"}
+GENRE_CACHE_PATH = Path("~/.cache/yt-music/genre_cache.json").expanduser()
+GENRE_CACHE_LOCK = threading.Lock()
+# IDs of the videos processed in this run, each is downloaded into its own directory
+VIDEO_IDS = set()
+VIDEO_IDS_LOCK = threading.Lock()
+GENRE_CACHE_MAX_AGE = 30 * 24 * 60 * 60
+GENRE_SIDECAR = ".genre"
+ID3_PADDING = 4096
+# ID3v2.3 tag without frames, only 4 KiB of padding (size is stored syncsafe)
+EMPTY_ID3_TAG = b"ID3\x03\x00\x00\x00\x00\x20\x00" + bytes(ID3_PADDING)
+SILENCE_FILTER = "silencedetect=noise=-50dB:duration=0.1"
+SILENCE_START_RE = re.compile(r"silence_start: (-?[\d.]+)")
+SILENCE_END_RE = re.compile(r"silence_end: (-?[\d.]+)")
+DURATION_RE = re.compile(r"Duration: (\d+):(\d+):([\d.]+)")
+# Looked up once per run, a batch spanning New Year’s Eve is an acceptable edge case
+CURRENT_YEAR = datetime.now().year
+URL_RE = re.compile(
+    r"https?://(?:(?:www|m|music)\.)?(?:youtube\.com/watch\?v=|youtu\.be/)"
+)
+YDL_OPTIONS = {
+    # Progress output of parallel downloads would only be interleaved
+    "quiet": True,
+    "no_warnings": True,
+    "windowsfilenames": True,
+    "no-playlist": True,
+    "embed-metadata": True,
+    "write-info-json": True,
+    "extract-audio": True,
+    "sponsorblock-remove": "all",
+    # Separate directory per video, parallel downloads of videos with the same title
+    # would use the same files otherwise
+    "outtmpl": "%(id)s/%(title)s.%(ext)s",
+    "format": "bestaudio/best",
+    "cookies": "~/.cache/yt-dlp/cookies.YouTube.txt",
+    # Fetch fragmented formats in parallel, request large chunks otherwise
+    "concurrent_fragment_downloads": 8,
+    "http_chunk_size": 10 * 1024 * 1024,
+    "postprocessors": [
+        # Constant bitrate, the audio isn’t encoded again afterwards
+        {
+            "key": "FFmpegExtractAudio",
+            "preferredcodec": "mp3",
+            "preferredquality": "192",
+        },
+        {"key": "SponsorBlock", "categories": ["all"]},
+        {"key": "ModifyChapters", "remove_sponsor_segments": ["all"]},
+    ],
+}
+# Use multiple connections per download if aria2c is installed
+if shutil.which("aria2c"):
+    YDL_OPTIONS["external_downloader"] = {"default": "aria2c"}
+    YDL_OPTIONS["external_downloader_args"] = {
+        "aria2c": ["-x", "16", "-s", "16", "-k", "1M"]
+    }
+# Links in the genre row of a Wikipedia infobox, without references
+GENRE_XPATH = (
+    ".//tr[th[normalize-space()='Genres' or normalize-space()='Genre(s)']]"
+    "/td//a[not(ancestor::sup)]/text()"
+)
+HTML_CHUNK_SIZE = 16 * 1024
+# Replacements of common annoyances in `normalize_filename`, single characters only
+CHARACTER_TABLE = str.maketrans(
+    {
+        "'": "’",
+        "/": "",
+        "|": "",
+        "–": "",
+        "⧸": "",
+        "＂": "",
+        "｜": "",
+        '"': "",
+    }
+)
+ALBUM_RE = re.compile(
+    # Prefix: Album, Single, EP, or Order (case insensitive) followed by comma or colon
+    # (optional) and whitespace. Only the prefix ignores case, the all uppercase album
+    # title below must not.
+    r"(?i:album|single|ep|order)[,:]?\s+"
+    "("  # Beginning of possible album title
+    # Album title enclosed in double quotes
+    '\"(.+?)\"|'
+    # Album title enclosed in single quotes
+    "'(.+?)'|"
+    # Album title enclosed in English typographic quotes
+    "“(.+?)”|"
+    # Album title enclosed in German typographic quotes
+    "„(.+?)“|"
+    # Album title enclosed between commas (e.g. “new album, Album title, out now”) or a
+    # period
+    r"([^,]+)\b|"
+    # Album title all uppercase
+    r"([A-Z]{2,}(?:\s+[A-Z]{2,})+)"
+    ")"  # End of possible album title
+)
+# Static replacements for `normalize_filename`, longest keys are tried first so that
+# e.g. “ (official video)” takes precedence over “ (official)”
+REPLACEMENTS = {
+    # Mostly suffixes in video titles
+    " (audio)": "",
+    " (hq)": "",
+    " (lyric video)": "",
+    " (lyrics)": "",
+    " (music video)": "",
+    " (official animated video)": "",
+    " (official audio)": "",
+    " (official lyric video)": "",
+    " (official lyrics video)": "",
+    " (official music video)": "",
+    " (official video)": "",
+    " (official video with lyrics)": "",
+    " (official visualizer)": "",
+    " (official)": "",
+    " (offizielles video)": "",
+    " (performance video)": "",
+    " [official video]": "",
+    " official audio video": "",
+    " official lyric video": "",
+    " official music video": "",
+    " official video clip": "",
+    " official video": "",
+    " – official video clip": "",
+    f" ({CURRENT_YEAR})": "",
+    # Normalize “featuring”
+    " ft. ": " feat. ",
+    " ft.": " feat.",
+}
+REPLACEMENTS_RE = re.compile(
+    "|".join(map(re.escape, sorted(REPLACEMENTS, key=len, reverse=True)))
+)
+
+
+def keep_feat_lowercase(word: str, **_) -> Optional[str]:
+    """
+    Callback for `titlecase` to keep “feat.” lowercase.
+
+    Parameters
+    ----------
+    word : str
+        The word to be titlecased.
+
+    Returns
+    -------
+    Optional[str]
+        The word unchanged if it is “feat.”, otherwise None to use the default
+        titlecasing.
+    """
+    return word if word == "feat." else None
+
+
+def maybe_titlecase(text: str) -> str:
+    """
+    Titlecase a text unless it already looks properly cased.
+
+    Parameters
+    ----------
+    text : str
+        The text to be titlecased.
+
+    Returns
+    -------
+    str
+        The text unchanged if it starts with an uppercase letter and isn’t all
+        uppercase, otherwise the titlecased text.
+    """
+    if text and text[0].isupper() and any(char.islower() for char in text):
+        return text
+    return cached_titlecase(text)
+
+
+@functools.lru_cache(maxsize=None)
+def uploader_pattern(uploader: str) -> re.Pattern:
+    """
+    Compile the pattern for removing the uploader from a filename, once per uploader.
+
+    Parameters
+    ----------
+    uploader : str
+        The lowercase name of the uploader.
+
+    Returns
+    -------
+    re.Pattern
+        The pattern matching the uploader as a suffix.
+    """
+    return re.compile(f"_ {re.escape(uploader)}| {re.escape(uploader)}")
 
 
 def normalize_filename(filename: str, uploader: str = "") -> str:
@@ -39,57 +235,21 @@ def normalize_filename(filename: str, uploader: str = "") -> str:
     str
         The normalized filename in the form `Artist - Title`.
     """
-    logging.info("Normalizing filename.")
     new_filename = os.path.basename(filename).lower()
 
-    # Order matters for groups: Some replacements build on top of others!
-    replace_chars = {
-        # Needs to come first, difficult to remove later
-        f" // {uploader}": "",
-        # Replacements of common annoyances
-        "'": "’",
-        "/": "",
-        "|": "",
-        "–": "",
-        "⧸": "",
-        "＂": "",
-        "｜": "",
-        '"': "",
-        # Mostly suffixes in video titles
-        " (audio)": "",
-        " (hq)": "",
-        " (lyric video)": "",
-        " (lyrics)": "",
-        " (music video)": "",
-        " (official animated video)": "",
-        " (official audio)": "",
-        " (official lyric video)": "",
-        " (official lyrics video)": "",
-        " (official music video)": "",
-        " (official video)": "",
-        " (official video with lyrics)": "",
-        " (official visualizer)": "",
-        " (official)": "",
-        " (offizielles video)": "",
-        " (performance video)": "",
-        " [official video]": "",
-        " official audio video": "",
-        " official lyric video": "",
-        " official music video": "",
-        " official video clip": "",
-        " official video": "",
-        " – official video clip": "",
-        f" ({datetime.now().year})": "",
-        f"_ {uploader.lower()}": "",
-        f" {uploader.lower()}": "",
-        # Normalize “featuring”
-        " ft. ": " feat. ",
-        " ft.": " feat.",
-        # Needs to come last, might be necessary after previous replacements
-        "  ": " ",
-    }
-    for char, repl in replace_chars.items():
-        new_filename = new_filename.replace(char, repl)
+    # Needs to come first, difficult to remove later
+    new_filename = new_filename.replace(f" // {uploader.lower()}", "")
+    new_filename = new_filename.translate(CHARACTER_TABLE)
+    # Single pass over the filename for all static replacements
+    new_filename = REPLACEMENTS_RE.sub(
+        lambda match: REPLACEMENTS[match.group(0)], new_filename
+    )
+    # Replacements depending on the uploader, only build the pattern if the uploader
+    # is part of the filename at all
+    if uploader and uploader.lower() in new_filename:
+        new_filename = uploader_pattern(uploader.lower()).sub("", new_filename)
+    # Needs to come last, might be necessary after previous replacements
+    new_filename = new_filename.replace("  ", " ")
 
     # Sometimes artists name their videos: `Artist: "Title"`
     parts = new_filename.split("： ")
@@ -108,62 +268,139 @@ def normalize_filename(filename: str, uploader: str = "") -> str:
             f"{feat_parts[1].split(' - ')[0]}"
         )
 
-    # Titlecase for the filename
-    new_filename = f"{titlecase(new_filename)}{extension}"
-    # feat. should be lowercase
-    new_filename = new_filename.replace(" Feat. ", " feat. ")
+    # Titlecase for the filename, feat. should be lowercase
+    new_filename = (
+        f"{cached_titlecase(new_filename, callback=keep_feat_lowercase)}{extension}"
+    )
 
-    logging.info("New filename: %s", new_filename)
+    logger.info("New filename: %s", new_filename)
     return new_filename
 
 
-def download_audio(url: str) -> Tuple[str, dict[str, str]]:
+def youtube_dl():
     """
-    Download the audio file from YouTube and return its path.
+    Create a yt-dlp instance with the options of this script.
+
+    Returns
+    -------
+    yt_dlp.YoutubeDL
+        The yt-dlp instance.
+    """
+    # Imported here, yt-dlp takes a while to load
+    from yt_dlp import YoutubeDL
+
+    # yt-dlp modifies its options in place, parallel downloads each need their own
+    return YoutubeDL(copy.deepcopy(YDL_OPTIONS))
+
+
+def extract_info(url: str) -> Tuple[str, dict[str, str]]:
+    """
+    Extract the information about a YouTube video without downloading it.
 
     Parameters
     ----------
     url : str
-        The URL of the YouTube video to download.
+        The URL of the YouTube video.
+
+    Returns
+    -------
+    Tuple[str, dict[str, str]]
+        The path the audio file will be downloaded to and the information about the
+        video.
+    """
+    logger.info("Extracting video information.")
+    with youtube_dl() as ydl:
+        info_dict = ydl.extract_info(url, download=False)
+        filename = f"{os.path.splitext(ydl.prepare_filename(info_dict))[0]}.mp3"
+        return filename, info_dict if info_dict else {"": ""}
+
+
+def download_audio(info_dict: dict[str, str], filename: str) -> str:
+    """
+    Download the audio file from YouTube and return its path.
+
+    Parameters
+    ----------
+    info_dict : dict[str, str]
+        The information about the video as returned by `extract_info`.
+    filename : str
+        The expected path of the audio file as returned by `extract_info`.
 
     Returns
     -------
     str
         The path to the downloaded audio file.
     """
-    logging.info("Downloading audio file.")
-    with YoutubeDL(
-        {
-            "windowsfilenames": True,
-            "no-playlist": True,
-            "embed-metadata": True,
-            "write-info-json": True,
-            "extract-audio": True,
-            "sponsorblock-remove": "all",
-            "outtmpl": "%(title)s.%(ext)s",
-            "format": "bestaudio/best",
-            "cookies": "~/.cache/yt-dlp/cookies.YouTube.txt",
-            "postprocessors": [
-                {"key": "FFmpegExtractAudio", "preferredcodec": "mp3"},
-                {"key": "SponsorBlock", "categories": ["all"]},
-                {"key": "ModifyChapters", "remove_sponsor_segments": ["all"]},
-            ],
-        }
-    ) as ydl:
-        info_dict = ydl.extract_info(url, download=False)
+    logger.info("Downloading audio file.")
+    with youtube_dl() as ydl:
         try:
-            _ = ydl.download(url)
+            # Reuse the extracted information instead of extracting it again
+            info_dict = ydl.process_ie_result(info_dict, download=True)
         except Exception as e:
             if "Unable to communicate with SponsorBlock API" in str(e):
-                logging.warning("SponsorBlock API is not available, segments might still be in the audio.")
+                logger.warning("SponsorBlock API is not available, segments might still be in the audio.")
             else:
                 raise e
-        filename = f"{os.path.splitext(ydl.prepare_filename(info_dict))[0]}.mp3"
-        return filename, info_dict if info_dict else {"": ""}
+    # yt-dlp knows the final path after post-processing, prefer it over the expected
+    # one
+    requested_downloads = info_dict.get("requested_downloads") or [{}]
+    return requested_downloads[0].get("filepath") or filename
+
+
+def split_artist_title(filename: str, uploader: str) -> Tuple[str, str]:
+    """
+    Split a normalized filename into artist and title.
+
+    Parameters
+    ----------
+    filename : str
+        The normalized filename in the form `Artist - Title`.
+    uploader : str
+        The name of the uploader, used as the artist if the filename only contains
+        the title.
+
+    Returns
+    -------
+    Tuple[str, str]
+        The artist and the title of the song.
+    """
+    try:
+        artist, title = filename.split(" - ", 1)
+        title = title.replace(".mp3", "")
+    except ValueError:
+        # Sometimes artists have their own channel and publish songs only with the title
+        title = filename.replace(".mp3", "")
+        artist = maybe_titlecase(uploader.replace(" - Topic", ""))
+    return artist, title
+
+
+@functools.lru_cache(maxsize=None)
+def artist_dir(artist: str) -> Path:
+    """
+    Resolve the directory of an artist, once per artist.
+
+    Parameters
+    ----------
+    artist : str
+        The name of the artist.
+
+    Returns
+    -------
+    Path
+        The resolved directory of the artist (with the casing of an existing
+        directory).
+    """
+    return (DESTINATION / artist).resolve()
 
 
 def set_tags(
-    filename: str, artist: str, title: str, year: str, album: str = "", genre: str = ""
+    filename: str,
+    artist: str,
+    title: str,
+    year: str,
+    album: str = "",
+    genre: str = "",
+    artist_dir_path: Optional[Path] = None,
 ):
     """
     Set artist, title, date, album, and genre tags for the audio file.
@@ -182,36 +419,126 @@ def set_tags(
         The name of the album, by default "".
     genre : str, optional
         The genre of the song, by default "".
+    artist_dir_path : Optional[Path], optional
+        The directory of the artist, used to fix the artist casing, by default None.
     """
-    logging.info("Setting tags.")
-    audio_file = eyed3.load(filename)
-    if not audio_file or not audio_file.tag:
-        # Handle the case where the file couldn’t be loaded or has no tags
-        logging.error("eyeD3 wasn’t able to load the file or find any tags.")
-        sys.exit(2)
-    tag = audio_file.tag
+    logger.info("Setting tags.")
+    from mutagen.easyid3 import EasyID3
+    from mutagen.mp3 import MP3
+
+    # A file that can’t be loaded fails only this video, not the whole batch
+    audio_file = MP3(filename, ID3=EasyID3)
+    if audio_file.tags is None:
+        audio_file.add_tags()
 
     # Fix artist casing if necessary
-    artist_dir_path = str(Path(os.path.join(DESTINATION, artist)).resolve())
-    if os.path.isdir(artist_dir_path):
+    if artist_dir_path and artist_dir_path.is_dir():
         # If an artist directory already exists, use its name instead of the one passed
         # as a parameter
-        artist = os.path.basename(artist_dir_path)
-    tag.artist = artist
+        artist = artist_dir_path.name
+    tags = {
+        "artist": artist,
+        "genre": genre,
+        "title": title,
+        "date": year,
+        "album": album,
+    }
+    for key, value in tags.items():
+        if value:
+            audio_file[key] = value
 
-    # Use reference files for genre if not user supplied
-    if not genre:
-        genre = find_genre(artist, artist_dir_path)
-    tag.genre = genre
+    # Same version as the empty tag in front of trimmed audio, so the update fits into
+    # its padding and the file isn’t rewritten. Untrimmed files still have the tag of
+    # yt-dlp without padding, they are rewritten once with the same padding reserved.
+    audio_file.save(
+        v2_version=3,
+        padding=lambda info: info.padding if info.padding >= 0 else ID3_PADDING,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def wikipedia_session():
+    """
+    Create the HTTP session shared by all Wikipedia requests.
+
+    Reusing the connections saves a TLS handshake for every artist in a batch.
+
+    Returns
+    -------
+    requests.Session
+        The session.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
 
-    tag.title = title
-    tag.recording_date = year
-    tag.album = album
+    session = requests.Session()
+    session.headers.update(WIKIPEDIA_HEADERS)
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+    return session
+
+
+@functools.lru_cache(maxsize=256)
+def wikipedia_page_html(lang: str, title: str) -> Optional[str]:
+    """
+    Fetch the HTML content of a Wikipedia page, cached for the lifetime of the process.
+
+    Parameters
+    ----------
+    lang : str
+        The language of the Wikipedia.
+    title : str
+        The title of the page.
+
+    Returns
+    -------
+    Optional[str]
+        The HTML content of the page or None if there is no such page.
+    """
+    # Redirects are followed, e.g. from “Ac/Dc” to “AC/DC”
+    response = wikipedia_session().get(
+        WIKIPEDIA_URL.format(lang=lang, title=quote(title.replace(" ", "_"), safe="")),
+        timeout=30,
+    )
+    if response.status_code == 404:
+        return None
+    response.raise_for_status()
+    return response.text
+
+
+@functools.lru_cache(maxsize=256)
+def wikipedia_search(lang: str, artist: str) -> Optional[str]:
+    """
+    Search Wikipedia for the page of an artist, cached for the lifetime of the process.
+
+    Parameters
+    ----------
+    lang : str
+        The language of the Wikipedia.
+    artist : str
+        The name of the artist.
 
-    tag.save()
+    Returns
+    -------
+    Optional[str]
+        The title of the best matching page or None if nothing was found.
+    """
+    response = wikipedia_session().get(
+        WIKIPEDIA_SEARCH_URL.format(lang=lang),
+        params={
+            "action": "query",
+            "list": "search",
+            "srsearch": f"{artist} {WIKIPEDIA_SEARCH_FILTERS.get(lang, '')}".strip(),
+            "srlimit": 1,
+            "format": "json",
+        },
+        timeout=30,
+    )
+    response.raise_for_status()
+    results = response.json().get("query", {}).get("search", [])
+    return results[0]["title"] if results else None
 
 
-def find_genre(artist: str, artist_dir_path: str = "") -> str:
+def find_genre(artist: str, artist_dir_path: Optional[Path] = None) -> str:
     """
     Try to find the main genre for an artist.
 
@@ -219,7 +546,7 @@ def find_genre(artist: str, artist_dir_path: str = "") -> str:
     ----------
     artist : str
         The name of the artist
-    artist_dir_path : str
+    artist_dir_path : Optional[Path]
         The directory where reference files might be found
 
     Returns
@@ -227,78 +554,253 @@ def find_genre(artist: str, artist_dir_path: str = "") -> str:
     str
         The genre for the artist
     """
-    # First try to find reference files
-    if os.path.isdir(artist_dir_path):
-        artist_files = os.listdir(artist_dir_path)
-        if len(artist_files) > 0:
-            reference_file = eyed3.load(os.path.join(artist_dir_path, artist_files[0]))
-            if not reference_file or not reference_file.tag:
-                logging.error(
-                    "eyeD3 wasn’t able to load the reference file or find any tags."
-                )
-            else:
-                logging.warning(
-                    "Using existing references for genre: %s", reference_file.tag.genre
-                )
-                return str(reference_file.tag.genre)
+    # First try to find reference files, then try to find it on Wikipedia
+    genre = genre_from_reference(artist_dir_path) or genre_from_wikipedia(artist)
+    if not genre:
+        logger.error(
+            "Still missing genre tag (no reference files or Wikipedia information "
+            "found)"
+        )
+    return genre
+
+
+def genre_from_reference(artist_dir_path: Optional[Path]) -> str:
+    """
+    Read the genre from an existing file of the artist.
+
+    Parameters
+    ----------
+    artist_dir_path : Optional[Path]
+        The directory where reference files might be found
+
+    Returns
+    -------
+    str
+        The genre of the first reference file or an empty string
+    """
+    if not artist_dir_path or not artist_dir_path.is_dir():
+        return ""
+
+    # The genre of earlier reference files is stored next to them
+    sidecar_path = artist_dir_path / GENRE_SIDECAR
+    try:
+        genre = sidecar_path.read_text(encoding="utf-8").strip()
+    except OSError:
+        genre = ""
+    if genre:
+        logger.warning("Using existing references for genre: %s", genre)
+        return genre
+
+    # Imported here, not needed at all if the genre is supplied by the user
+    from mutagen.id3 import ID3, ID3NoHeaderError
+
+    # Only the first MP3 file is needed, no need to list the whole directory
+    with os.scandir(artist_dir_path) as artist_files:
+        reference_file = next(
+            (entry for entry in artist_files if entry.name.endswith(".mp3")), None
+        )
+    if not reference_file:
+        return ""
+
+    # Only read the ID3 tag, not the audio frames or the whole file
+    try:
+        genre_frame = ID3(reference_file.path).get("TCON")
+    except ID3NoHeaderError:
+        genre_frame = None
+    if not genre_frame:
+        logger.error("Couldn’t find a genre tag in the reference file.")
+        return ""
+
+    genre = ";".join(genre_frame.genres)
+    logger.warning("Using existing references for genre: %s", genre)
+    try:
+        sidecar_path.write_text(genre, encoding="utf-8")
+    except OSError as e:
+        logger.error("Couldn’t save the genre next to the reference files: %s", e)
+    return genre
+
+
+def genre_from_wikipedia(artist: str) -> str:
+    """
+    Extract the genres of an artist from the infobox of their Wikipedia page.
+
+    Found genres are cached across runs, so every artist is only looked up once every
+    30 days.
+
+    Parameters
+    ----------
+    artist : str
+        The name of the artist
+
+    Returns
+    -------
+    str
+        The genres of the artist or an empty string
+    """
+    # “AC/DC” and “Ac/Dc” are the same artist
+    cache_key = artist.strip().casefold()
+    with GENRE_CACHE_LOCK:
+        genre_cache = load_genre_cache()
+        cached = genre_cache.get(cache_key)
+    # Genres of active artists change occasionally, so look them up again eventually.
+    # Entries of older versions or edited by hand might not have a timestamp.
+    if (
+        isinstance(cached, dict)
+        and isinstance(cached.get("genre"), str)
+        and isinstance(cached.get("timestamp"), (int, float))
+        and time.time() - cached["timestamp"] < GENRE_CACHE_MAX_AGE
+    ):
+        logger.warning("Using cached genre: %s", cached["genre"])
+        return cached["genre"]
+
+    import requests
 
-    # If a genre is still not found, try to find it on Wikipedia
     for lang in ["en", "de"]:
-        wikipedia.set_lang(lang)
+        # Next, parse the HTML content of the page and extract the artist’s genres from
+        # the infobox
         try:
-            page = wikipedia.page(artist)
-        except wikipedia.exceptions.PageError:
-            logging.error("Couldn’t find a %s Wikipedia page for %s", lang, artist)
+            page_html = wikipedia_page_html(lang, artist)
+            genres = infobox_genres(page_html) if page_html else []
+            if not genres:
+                # The page of the artist might have a different title, e.g.
+                # “Muse (band)” instead of the page about the word “Muse”
+                title = wikipedia_search(lang, artist)
+                if title and title != artist:
+                    logger.info("Trying %s Wikipedia page %s instead", lang, title)
+                    page_html = wikipedia_page_html(lang, title)
+                    genres = infobox_genres(page_html) if page_html else []
+        except requests.RequestException as e:
+            # The genre is optional, not worth losing the download over
+            logger.error("Couldn’t reach the %s Wikipedia: %s", lang, e)
             continue
-
-        # Next, parse the HTML content of the page using BeautifulSoup
-        soup = BeautifulSoup(page.html(), "html.parser")
-
-        # Look for the infobox on the page, which contains information about the artist
-        infobox = soup.find("table", {"class": "infobox"})
-        if not infobox:
-            logging.error(
-                "Couldn’t find an infobox on the %s %s Wikipedia page", lang, artist
+        if not genres:
+            logger.error(
+                "Couldn’t find genres in an infobox on a %s Wikipedia page for %s",
+                lang,
+                artist,
             )
             continue
 
-        # Look for the row in the infobox that contains the artist’s genre
-        for row in infobox.find_all("tr"):
-            if row.th and (row.th.text in ("Genres", "Genre(s)")):
-                # If we found the right row, extract the genre(s) and return the first
-                # one
-                return titlecase(row.td.find("a").text).replace("-", " ")
+        genre = ";".join(map(cached_titlecase, genres)).replace("-", " ")
+        with GENRE_CACHE_LOCK:
+            genre_cache[cache_key] = {"genre": genre, "timestamp": time.time()}
+            save_genre_cache(genre_cache)
+        return genre
 
-    logging.error(
-        "Still missing genre tag (no reference files or Wikipedia information found)"
-    )
     return ""
 
 
-def move_file(filename: str, artist: str, title: str):
+def infobox_genres(page_html: str) -> list[str]:
+    """
+    Extract the genres from the infobox of a Wikipedia page.
+
+    The page is only parsed up to the end of the infobox, which is usually close to
+    the beginning.
+
+    Parameters
+    ----------
+    page_html : str
+        The HTML content of the page.
+
+    Returns
+    -------
+    list[str]
+        The genres listed in the infobox.
+    """
+    import lxml.etree
+
+    parser = lxml.etree.HTMLPullParser(events=("end",), tag="table")
+    for offset in range(0, len(page_html), HTML_CHUNK_SIZE):
+        parser.feed(page_html[offset : offset + HTML_CHUNK_SIZE])
+        for _, table in parser.read_events():
+            if "infobox" in table.get("class", "").split():
+                return [str(genre) for genre in table.xpath(GENRE_XPATH)]
+    return []
+
+
+@functools.lru_cache(maxsize=None)
+def load_genre_cache() -> dict[str, dict]:
+    """
+    Load the genres found on Wikipedia in previous runs, once per process.
+
+    Must be called with `GENRE_CACHE_LOCK` held, the cache is only loaded once for
+    all threads this way.
+
+    Returns
+    -------
+    dict[str, dict]
+        The cached genres and when they were found by normalized artist name.
+    """
+    try:
+        genre_cache = json.loads(GENRE_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return genre_cache if isinstance(genre_cache, dict) else {}
+
+
+def save_genre_cache(genre_cache: dict[str, dict]):
+    """
+    Save the genres found on Wikipedia for the next runs.
+
+    Parameters
+    ----------
+    genre_cache : dict[str, dict]
+        The cached genres and when they were found by normalized artist name.
+    """
+    try:
+        GENRE_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        GENRE_CACHE_PATH.write_text(
+            json.dumps(genre_cache, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+    except OSError as e:
+        logger.error("Couldn’t save the genre cache: %s", e)
+
+
+def move_file(filename: str, artist_dir_path: Path, title: str):
     """
     Move the audio file to the appropriate directory.
 
+    An existing song with the same title is kept, the new file is numbered instead.
+
     Parameters
     ----------
     filename : str
         The path to the audio file.
-    artist : str
-        The name of the artist.
+    artist_dir_path : Path
+        The directory of the artist.
     title : str
         The title of the song.
     """
-    artist_dir_path = str(Path(os.path.join(DESTINATION, artist)).resolve())
-    os.makedirs(artist_dir_path, exist_ok=True)
-    output_path = os.path.join(artist_dir_path, f"{title}.mp3")
-    shutil.move(filename, output_path)
-    logging.info("Moved file to %s", output_path)
+    artist_dir_path.mkdir(parents=True, exist_ok=True)
+    # Claim the name by creating the file exclusively, so parallel downloads of songs
+    # with the same title can’t overwrite each other either
+    for number in itertools.count(1):
+        suffix = f" ({number})" if number > 1 else ""
+        output_path = artist_dir_path / f"{title}{suffix}.mp3"
+        try:
+            with open(output_path, "xb"):
+                break
+        except FileExistsError:
+            continue
+    try:
+        try:
+            os.replace(filename, output_path)
+        except OSError:
+            # Destination is on a different drive, copy (keeping the timestamps)
+            # instead
+            shutil.move(filename, output_path)
+    except OSError:
+        # Don’t leave the claimed name behind as an empty song
+        output_path.unlink(missing_ok=True)
+        raise
+    logger.info("Moved file to %s", output_path)
 
 
-def process_audio(url: str, album: str = "", genre: str = ""):
+def process_audio(
+    url: str, album: str = "", genre: str = ""
+) -> Optional[Tuple[str, Path, str]]:
     """
-    Download the audio file from YouTube, process it, set appropriate tags, and move it
-    to the appropriate directory.
+    Download the audio file from YouTube, process it, and set appropriate tags.
 
     Parameters
     ----------
@@ -308,101 +810,231 @@ def process_audio(url: str, album: str = "", genre: str = ""):
         The name of the album, by default "".
     genre : str, optional
         The genre of the song, by default "".
+
+    Returns
+    -------
+    Optional[Tuple[str, Path, str]]
+        The path to the audio file, the directory of the artist, and the title of the
+        song, i.e. the arguments for `move_file`, or None if the video is already
+        processed for another URL.
     """
-    # Download file
-    filename, info_dict = download_audio(url)
+    # Extract information first, so the genre can be looked up during the download
+    filename, info_dict = extract_info(url)
+
+    # Different URLs of the same video would share the download directory
+    with VIDEO_IDS_LOCK:
+        if info_dict["id"] in VIDEO_IDS:
+            logger.warning("Skipping %s, the video is already in this batch.", url)
+            return None
+        VIDEO_IDS.add(info_dict["id"])
 
     # Normalize filename
     new_filename = normalize_filename(filename, info_dict["uploader"])
+    artist, title = split_artist_title(new_filename, info_dict["uploader"])
+    artist_dir_path = artist_dir(artist)
 
-    try:
-        os.rename(filename, new_filename)
-    except FileExistsError:
-        # Probably an error during the previous download, so just remove the old file
-        os.remove(filename)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Use reference files or Wikipedia for genre if not user supplied
+        genre_lookup = None
+        if not genre:
+            genre_lookup = executor.submit(find_genre, artist, artist_dir_path)
 
-    artist, title = "", ""
-    try:
-        artist, title = new_filename.split(" - ", 1)
-        title = title.replace(".mp3", "")
-    except ValueError:
-        # Sometimes artists have their own channel and publish songs only with the title
-        title = new_filename.replace(".mp3", "")
-        artist = titlecase(info_dict["uploader"].replace(" - Topic", ""))
+        # Download file, keep it in the directory of the video until it is moved
+        filename = download_audio(info_dict, filename)
+        audio_file = os.path.join(os.path.dirname(filename), new_filename)
+        try:
+            os.rename(filename, audio_file)
+        except FileExistsError:
+            # Probably an error during the previous download, so just remove the old
+            # file
+            os.remove(filename)
+
+        if genre_lookup:
+            genre = genre_lookup.result()
 
     # Set tags (artist, title, date)
     year = info_dict["upload_date"][:4]
-    logging.warning("Using upload date as publication date: %s", year)
+    logger.warning("Using upload date as publication date: %s", year)
     if not album:
         # FIXME Album cannot be extracted by yt-dlp:
         # https://github.com/onnowhere/youtube_music_playlist_downloader/issues/6
-        pattern = (
-            # Prefix: Album, Single, EP, or Order (case insensitive) followed by comma
-            # or colon (optional) and whitespace.
-            r"(?:album|Album|ALBUM|single|Single|SINGLE|ep|EP|order|Order|ORDER)[,:]?\s+"
-            "("  # Beginning of possible album title
-            # Album title enclosed in double quotes
-            '\"(.+?)\"|'
-            # Album title enclosed in single quotes
-            "'(.+?)'|"
-            # Album title enclosed in English typographic quotes
-            "“(.+?)”|"
-            # Album title enclosed in German typographic quotes
-            "„(.+?)“|"
-            # Album title enclosed between commas (e.g. “new album, Album title, out
-            # now”) or a period
-            r"([^,]+)\b|"
-            # Album title all uppercase
-            r"([A-Z]{2,}(?:\s+[A-Z]{2,})+)"
-            ")"  # End of possible album title
-        )
-        match = re.search(pattern, info_dict["description"])
+        match = ALBUM_RE.search(info_dict["description"])
         if match:
             if isinstance(match, str):
-                album = titlecase(match)
+                album = cached_titlecase(match)
             else:
                 # More specific matches are at the end, so reverse the list
                 for group in match.groups()[::-1]:
                     if group:
-                        album = titlecase(group)
+                        album = cached_titlecase(group)
                         break
-            logging.warning("Extracted album from description: %s", album)
+            logger.warning("Extracted album from description: %s", album)
         else:
-            logging.error(
+            logger.error(
                 "Regex for album extraction failed. "
                 '`info_dict["description"]` for debugging purposes: %s. Trying to '
                 "extract with pattern %s.",
                 info_dict["description"],
-                pattern,
+                ALBUM_RE.pattern,
             )
     else:
-        logging.warning("Using album supplied by user: %s", album)
-    set_tags(new_filename, artist, title, year, album, genre)
+        logger.warning("Using album supplied by user: %s", album)
+
+    # Trim silence at beginning and end
+    edit_audio(audio_file)
+
+    # Set tags last, they fit into the space reserved by `edit_audio`
+    set_tags(audio_file, artist, title, year, album, genre, artist_dir_path)
+
+    return audio_file, artist_dir_path, title
+
+
+def detect_silence(audio_file: str) -> Tuple[float, Optional[float]]:
+    """
+    Detect silence at the beginning and the end of the audio.
+
+    Parameters
+    ----------
+    audio_file : str
+        The path to the audio file.
+
+    Returns
+    -------
+    Tuple[float, Optional[float]]
+        The position in seconds where the audio starts and where it ends (None if
+        there is no silence at the end).
+    """
+    # ffmpeg reports the detected silence on stderr. The analysis only needs a single
+    # channel, nothing is decoded into Python.
+    output = subprocess.run(
+        [
+            "ffmpeg",
+            "-hide_banner",
+            "-nostats",
+            "-i",
+            audio_file,
+            "-map",
+            "0:a:0",
+            "-ac",
+            "1",
+            "-af",
+            SILENCE_FILTER,
+            "-f",
+            "null",
+            "-",
+        ],
+        stderr=subprocess.PIPE,
+        encoding="utf-8",
+        errors="replace",
+        check=True,
+    ).stderr
+    silence_starts = [float(start) for start in SILENCE_START_RE.findall(output)]
+    silence_ends = [float(end) for end in SILENCE_END_RE.findall(output)]
+    if not silence_starts:
+        return 0.0, None
+
+    audio_start = 0.0
+    if silence_starts[0] <= 0 and silence_ends:
+        audio_start = silence_ends[0]
+
+    # Older ffmpeg versions don’t report the end of silence at the end of the file
+    audio_end = None
+    duration = DURATION_RE.search(output)
+    if len(silence_ends) < len(silence_starts):
+        audio_end = silence_starts[-1]
+    elif duration:
+        hours, minutes, seconds = duration.groups()
+        duration_seconds = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+        if silence_ends[-1] >= duration_seconds - 0.05:
+            audio_end = silence_starts[-1]
+    # Nothing but silence, keep the audio as it is instead of cutting everything
+    if audio_end is not None and audio_end <= audio_start:
+        return 0.0, None
+    return audio_start, audio_end
 
-    # Trim silence at beginning and end, normalize to 89 dB
-    edit_audio(new_filename)
-              
-    # Move file to appropriate directory
-    move_file(new_filename, artist, title)
+
+def trim_audio(audio_file: str, audio_start: float, audio_end: Optional[float]):
+    """
+    Cut the audio file to the given positions.
+
+    Parameters
+    ----------
+    audio_file : str
+        The path to the audio file.
+    audio_start : float
+        The position in seconds where the audio starts.
+    audio_end : Optional[float]
+        The position in seconds where the audio ends or None to keep the end.
+    """
+    trim_args = ["-ss", str(audio_start)]
+    if audio_end is not None:
+        trim_args += ["-to", str(audio_end)]
+    # Cut at frame boundaries by copying the audio stream, without decoding and
+    # encoding again. The result is piped back instead of going through a temporary
+    # file (the download has a constant bitrate, so there is no VBR header to update).
+    edited_audio = subprocess.run(
+        [
+            "ffmpeg",
+            "-loglevel",
+            "error",
+            "-i",
+            audio_file,
+            *trim_args,
+            "-map",
+            "0:a",
+            "-codec:a",
+            "copy",
+            "-id3v2_version",
+            "0",
+            "-f",
+            "mp3",
+            "pipe:1",
+        ],
+        stdout=subprocess.PIPE,
+        check=True,
+    ).stdout
+    # Reserve space for the tags, so they can be written without rewriting the file.
+    # Replace the download only once the edited audio is completely written.
+    temporary_file = f"{audio_file}.tmp"
+    Path(temporary_file).write_bytes(EMPTY_ID3_TAG + edited_audio)
+    os.replace(temporary_file, audio_file)
 
 
 def edit_audio(audio_file: str):
     """
-    Edit the audio by removing silence and normalizing loudness.
+    Edit the audio by removing silence.
 
     Parameters
     ----------
     audio_file : str
         The path to the audio file to be edited.
     """
-    sound = AudioSegment.from_file(audio_file, format="mp3")
-    logging.info("Stripping silence from audio file.")
-    sound.strip_silence()
-    sound.export(audio_file, format="mp3")
+    logger.info("Stripping silence from audio file.")
+    audio_start, audio_end = detect_silence(audio_file)
+    # SponsorBlock often already removed intros and outros, nothing to cut then
+    if audio_start > 0 or audio_end is not None:
+        trim_audio(audio_file, audio_start, audio_end)
+    else:
+        logger.info("No silence found at the beginning or the end.")
 
-    # Normalize loudness
-    logging.info("Normalizing loudness of audio file.")
-    _ = subprocess.run(["mp3gain", "-r", "-p", audio_file], check=True)
+
+def normalize_loudness(audio_files: list[str]):
+    """
+    Normalize the loudness of all audio files with a single mp3gain run.
+
+    Parameters
+    ----------
+    audio_files : list[str]
+        The paths to the audio files.
+    """
+    # mp3gain adjusts the global gain of each frame losslessly instead of encoding
+    # again. Each file is normalized on its own, the batch may contain unrelated songs.
+    logger.info("Normalizing loudness of %d audio file(s).", len(audio_files))
+    # Video IDs, and with them the paths, can start with “-”, absolute paths can’t be
+    # mistaken for options
+    _ = subprocess.run(
+        ["mp3gain", "-r", "-k", "-p", *map(os.path.abspath, audio_files)], check=True
+    )
 
 
 def main():
@@ -410,19 +1042,68 @@ def main():
     Download audio file, process it, set appropriate tags, and move it to the
     appropriate directory.
     """
-    # Print usage information
-    if len(sys.argv) < 2 or len(sys.argv) > 4:
-        logging.error(
-            "Usage: %s https://www.youtube.com/watch?v=aDaoQk081IY [ALBUM] [GENRE]",
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s:%(message)s")
+
+    # One or more URLs, optionally followed by album and genre for all of them
+    urls = list(itertools.takewhile(URL_RE.match, sys.argv[1:]))
+    arguments = sys.argv[1 + len(urls) :]
+    # Identical URLs don’t need to be extracted twice, other URLs of the same video are
+    # skipped by `process_audio`
+    urls = list(dict.fromkeys(urls))
+
+    # Print usage information, before anything slow is loaded
+    if not urls or len(arguments) > 2:
+        logger.error(
+            "Usage: %s https://www.youtube.com/watch?v=aDaoQk081IY [URL ...] [ALBUM] "
+            "[GENRE]",
             sys.argv[0],
         )
         sys.exit(1)
 
-    url = sys.argv[1]
-    album = sys.argv[2] if len(sys.argv) >= 3 else ""
-    genre = sys.argv[3] if len(sys.argv) >= 4 else ""
+    album = arguments[0] if len(arguments) >= 1 else ""
+    genre = arguments[1] if len(arguments) >= 2 else ""
 
-    process_audio(url, album, genre)
+    # Downloads, Wikipedia requests, and ffmpeg all wait outside of Python most of the
+    # time, so multiple videos are processed in parallel
+    songs = []
+    failed = 0
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {
+            executor.submit(process_audio, url, album, genre): url for url in urls
+        }
+        for future in as_completed(futures):
+            # A failed video shouldn’t cost the rest of the batch
+            try:
+                song = future.result()
+            except Exception:
+                logger.exception("Couldn’t process %s, skipping it.", futures[future])
+                failed += 1
+                continue
+            if song:
+                songs.append(song)
+
+    # Normalize loudness, one mp3gain process for the whole batch
+    if songs:
+        try:
+            normalize_loudness([filename for filename, _, _ in songs])
+        except (OSError, subprocess.CalledProcessError) as e:
+            logger.error("Couldn’t normalize loudness: %s", e)
+
+    # Move files to appropriate directories
+    for filename, artist_dir_path, title in songs:
+        try:
+            move_file(filename, artist_dir_path, title)
+        except OSError as e:
+            logger.error("Couldn’t move %s: %s", filename, e)
+            failed += 1
+            continue
+        # Remove the directory of the video, unless yt-dlp left other files in it
+        with contextlib.suppress(OSError):
+            os.rmdir(os.path.dirname(filename))
+
+    if failed:
+        logger.error("%d of %d video(s) failed.", failed, len(urls))
+        sys.exit(2)
 
 
 if __name__ == "__main__":